@@ -29,18 +29,24 @@ Example usage:
 
 from .manager import ConfigManager
 from .converters import (
+    LayeredDict,
     convert_value_to_type,
     dataclass_to_dict,
     dict_to_dataclass,
     deep_merge,
+    deep_merge_layers,
+    merge_layers_to_dataclass,
 )
 
 __all__ = [
     "ConfigManager",
+    "LayeredDict",
     "convert_value_to_type",
     "dataclass_to_dict", 
     "dict_to_dataclass",
     "deep_merge",
+    "deep_merge_layers",
+    "merge_layers_to_dataclass",
 ]
 
 __version__ = "0.1.0"
\ No newline at end of file
@@ -4,19 +4,35 @@ Type conversion and dictionary utilities for the config manager.
 This module provides functions for:
 - Converting between dataclasses and dictionaries
 - Converting values to specified types, handling Optional and other special types
-- Deep merging of dictionaries with proper overriding
+- Deep merging of dictionaries (or whole stacks of layers) with proper overriding
 """
 
 import ast
-from dataclasses import fields
+from collections.abc import Mapping
+from dataclasses import MISSING, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, Tuple, Union, get_args, get_origin, get_type_hints
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type, Tuple, Union, get_args, get_origin, get_type_hints
+
+from .frozen import FROZEN_TYPES, thaw
+
+
+@lru_cache(maxsize=None)
+def _cached_type_hints(cls: Type) -> Dict[str, Any]:
+    """Return the resolved type hints of a class, computed once per class."""
+    return get_type_hints(cls)
 
 
 def deep_merge(override: dict, base: dict) -> dict:
     """Recursively merge override dict into base dict.
     
     The override dictionary takes precedence over the base dictionary.
+    Neither input is modified, but the result shares any sub-dictionaries
+    that the merge did not need to touch, so callers must not mutate the
+    inputs after merging. Frozen inputs (as returned by load_yaml_config
+    with frozen=True) are merged like dicts and lists, and end up in the
+    result as plain, mutable copies.
     
     Args:
         override: Dictionary with values to override
@@ -25,19 +41,188 @@ def deep_merge(override: dict, base: dict) -> dict:
     Returns:
         Merged dictionary
     """
-    result = dict(base)
-    for k, v in override.items():
-        if (
-            isinstance(v, dict)
-            and k in result
-            and isinstance(result[k], dict)
-        ):
-            result[k] = deep_merge(v, result[k])
-        else:
-            result[k] = v
+    if not override:
+        return _unfrozen(base)
+    if not base:
+        return _plain_copy(override)
+    
+    result = _plain_copy(base)
+    # Merge nested dicts with a worklist instead of recursion. Each base sub-dict is
+    # copied before it is written to, so the inputs are never modified.
+    stack = [(result, override)]
+    while stack:
+        target, source = stack.pop()
+        for k, v in source.items():
+            base_value = target.get(k)
+            if isinstance(v, _DICT_TYPES) and isinstance(base_value, _DICT_TYPES):
+                merged = target[k] = _plain_copy(base_value)
+                stack.append((merged, v))
+            else:
+                target[k] = _unfrozen(v)
+    return result
+
+
+def deep_merge_layers(*layers: dict) -> dict:
+    """Merge any number of dicts in one pass, later layers taking precedence.
+    
+    Equivalent to folding deep_merge over the layers from lowest to highest
+    priority, but each key is visited once instead of once per layer. As with
+    deep_merge, untouched sub-dictionaries are shared with the inputs, and
+    frozen inputs end up in the result as plain, mutable copies.
+    
+    Args:
+        *layers: Dictionaries ordered from lowest to highest priority
+        
+    Returns:
+        Merged dictionary
+    """
+    layers = [layer for layer in layers if layer]
+    if not layers:
+        return {}
+    if len(layers) == 1:
+        return _unfrozen(layers[0])
+    
+    layers_high_to_low = layers[::-1]
+    result = {}
+    for layer in layers:
+        for k in layer:
+            if k not in result:
+                result[k] = _merged_layer_value(k, layers_high_to_low)
     return result
 
 
+def _merged_layer_value(key: Any, layers_high_to_low: List[dict]) -> Any:
+    """Resolve the merged value of a key across layers ordered from highest priority."""
+    nested = []
+    for layer in layers_high_to_low:
+        if key in layer:
+            value = layer[key]
+            if not isinstance(value, _DICT_TYPES):
+                if not nested:
+                    return _unfrozen(value)
+                # A non-dict in a lower layer is hidden by the dicts above it
+                break
+            nested.append(value)
+    if len(nested) == 1:
+        return _unfrozen(nested[0])
+    return deep_merge_layers(*nested[::-1])
+
+
+def _unfrozen(value: Any) -> Any:
+    """Return value, or a plain, mutable copy of it if it is frozen config data."""
+    return thaw(value) if type(value) in FROZEN_TYPES else value
+
+
+def _plain_copy(mapping: Mapping) -> dict:
+    """Return a copy of a mapping as a plain dict, a deep one if the mapping is frozen."""
+    return mapping.copy() if type(mapping) is dict else thaw(mapping)
+
+
+class LayeredDict(Mapping):
+    """Read-only view that resolves keys across dict layers without merging them.
+    
+    Looking up a key gives the same value deep_merge_layers would produce for it,
+    except that a nested dict contributed by more than one layer comes back as
+    another LayeredDict over those sub-dicts instead of being merged eagerly, and
+    values from frozen layers are returned as they are, read-only.
+    Use to_dict() to materialize the fully merged dictionary.
+    
+    Args:
+        *layers: Dictionaries ordered from lowest to highest priority
+    """
+    
+    __slots__ = ('_layers', '_layers_high_to_low')
+    
+    def __init__(self, *layers: dict):
+        self._layers = [layer for layer in layers if layer]
+        self._layers_high_to_low = self._layers[::-1]
+    
+    def __getitem__(self, key: Any) -> Any:
+        nested = []
+        for layer in self._layers_high_to_low:
+            if key in layer:
+                value = layer[key]
+                if not isinstance(value, _DICT_TYPES):
+                    if not nested:
+                        return value
+                    break
+                nested.append(value)
+        if not nested:
+            raise KeyError(key)
+        if len(nested) == 1:
+            return nested[0]
+        return LayeredDict(*nested[::-1])
+    
+    def __contains__(self, key: Any) -> bool:
+        return any(key in layer for layer in self._layers)
+    
+    def __iter__(self):
+        seen = set()
+        for layer in self._layers:
+            for k in layer:
+                if k not in seen:
+                    seen.add(k)
+                    yield k
+    
+    def __len__(self) -> int:
+        return len(set().union(*self._layers))
+    
+    def __repr__(self) -> str:
+        return f"LayeredDict({', '.join(repr(layer) for layer in self._layers)})"
+    
+    def to_dict(self) -> dict:
+        """Return the fully merged dictionary, as deep_merge_layers would."""
+        return deep_merge_layers(*self._layers)
+
+
+# Mapping types that are merged as nested dicts
+_DICT_TYPES = (dict, MappingProxyType)
+# Values that _copy_value has to copy or materialize
+_CONTAINER_TYPES = FROZEN_TYPES | {dict, list, LayeredDict}
+
+
+def _copy_value(value: Any) -> Any:
+    """Return a plain, mutable deep copy of a config value (see frozen.thaw).
+    
+    A LayeredDict is materialized first.
+    """
+    if type(value) is LayeredDict:
+        value = value.to_dict()
+    return thaw(value)
+
+
+def _to_bool(value: Any) -> bool:
+    """Convert a value to bool, accepting common string spellings of true."""
+    if isinstance(value, str):
+        return value.lower() in ('true', 'yes', '1', 'y')
+    return bool(value)
+
+
+def _to_int(value: Any) -> int:
+    """Convert a value to int, accepting float-formatted strings like "1e3"."""
+    if type(value) is int:
+        return value
+    return int(float(value)) if isinstance(value, str) else int(value)
+
+
+def _to_path(value: Any) -> Path:
+    """Convert a value to Path, passing through values that already are one."""
+    return value if isinstance(value, Path) else Path(value)
+
+
+# Converters for the basic types handled by convert_value_to_type
+_CONVERTERS = {
+    bool: _to_bool,
+    int: _to_int,
+    float: float,
+    str: str,
+    Path: _to_path,
+}
+
+# Item types whose lists can be copied as-is when every item has exactly that type
+_EXACT_ITEM_TYPES = (bool, int, float, str)
+
+
 def convert_value_to_type(value: Any, target_type: type) -> Any:
     """Convert a value to the specified target type, handling special cases.
     
@@ -61,58 +246,113 @@ def convert_value_to_type(value: Any, target_type: type) -> Any:
     # Handle None values
     if value is None:
         return None
-        
-    # Handle Optional types
+    return _compile_converter(target_type)(value)
+
+
+def _compile_converter(target_type: Any) -> Callable[[Any], Any]:
+    """Return a converter for non-None values of target_type, built once per type."""
+    try:
+        return _compile_converter_cached(target_type)
+    except TypeError:
+        # Unhashable annotation, build an uncached converter
+        return _build_converter(target_type)
+
+
+def _build_converter(target_type: Any) -> Callable[[Any], Any]:
+    """Build a converter for non-None values of target_type (see convert_value_to_type)."""
     origin = get_origin(target_type)
+    
+    # Handle Optional types
     if origin is Union:
-        # Get the non-None type from Optional[T]
         args = get_args(target_type)
         if len(args) == 2 and type(None) in args:
-            target_type = next(arg for arg in args if arg is not type(None))
-        else:
-            # For other Union types, try each type until one works
-            for arg in args:
+            # Get the non-None type from Optional[T]
+            return _compile_converter(args[0] if args[1] is type(None) else args[1])
+        
+        # For other Union types, try each type until one works
+        member_converters = [_compile_converter(arg) for arg in args]
+        
+        def convert_union(value: Any) -> Any:
+            for convert in member_converters:
                 try:
-                    return convert_value_to_type(value, arg)
+                    return convert(value)
                 except (ValueError, TypeError):
                     continue
             raise ValueError(f"Could not convert {value} to any of {args}")
+        return convert_union
     
     # Handle basic types
-    if target_type == bool:
-        if isinstance(value, str):
-            return value.lower() in ('true', 'yes', '1', 'y')
-        return bool(value)
-    elif target_type == int:
-        return int(float(value)) if isinstance(value, str) else int(value)
-    elif target_type == float:
-        return float(value)
-    elif target_type == str:
-        return str(value)
-    elif target_type == Path:
-        return Path(value)
-    elif get_origin(target_type) is list:
-        item_type = get_args(target_type)[0]
+    converter = _CONVERTERS.get(target_type) if isinstance(target_type, type) else None
+    if converter is not None:
+        return converter
+    
+    if origin is list:
+        return _build_list_converter(get_args(target_type)[0])
+    
+    # If no special handling is needed, return the value as is
+    return _identity
+
+
+_compile_converter_cached = lru_cache(maxsize=512)(_build_converter)
+
+
+def _identity(value: Any) -> Any:
+    """Converter for types without special handling."""
+    return value
+
+
+def _build_list_converter(item_type: Any) -> Callable[[Any], Any]:
+    """Build a converter for List[item_type] values, including their string forms."""
+    convert_item = _compile_converter(item_type)
+    exact_type = item_type if item_type in _EXACT_ITEM_TYPES else None
+    
+    def convert_list(value: Any) -> list:
         if isinstance(value, str):
-            # Try to parse string representation of a list (e.g., "[1,2,3]" or "1,2,3")
-            try:
-                # Handle strings like "[1, 2, 3]"
-                parsed_value = ast.literal_eval(value)
-                if not isinstance(parsed_value, list):
-                    raise ValueError("String did not evaluate to a list.")
-                return [convert_value_to_type(item, item_type) for item in parsed_value]
-            except (ValueError, SyntaxError):
-                # Handle strings like "1,2,3" (comma-separated without brackets)
+            # Parse string representation of a list (e.g., "[1,2,3]" or "1,2,3")
+            if value.lstrip().startswith('['):
+                # Handle strings like "[1, 2, 3]"; only these need a full literal_eval
                 try:
-                    return [convert_value_to_type(item.strip(), item_type) for item in value.split(',')]
-                except Exception as e:
-                    raise ValueError(f"Could not parse string '{value}' as list for item type {item_type}. Original error: {e}")
+                    parsed_value = ast.literal_eval(value)
+                    if not isinstance(parsed_value, list):
+                        raise ValueError("String did not evaluate to a list.")
+                    return [None if item is None else convert_item(item) for item in parsed_value]
+                except (ValueError, SyntaxError):
+                    pass
+            # Handle strings like "1,2,3" (comma-separated without brackets)
+            try:
+                return [convert_item(item.strip()) for item in value.split(',')]
+            except Exception as e:
+                raise ValueError(f"Could not parse string '{value}' as list for item type {item_type}. Original error: {e}")
         elif not isinstance(value, list):
             raise ValueError(f"Expected list or string representation of a list, got {type(value)}")
-        # If value is already a list
-        return [convert_value_to_type(item, item_type) for item in value]
+        # If value is already a list, skip converting items that are already typed
+        if convert_item is _identity or (exact_type is not None and all(type(item) is exact_type for item in value)):
+            return list(value)
+        return [None if item is None else convert_item(item) for item in value]
+    return convert_list
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: Type) -> Tuple[str, ...]:
+    """Return the names of the real fields of a dataclass, computed once per class."""
+    return tuple([f.name for f in fields(cls)])
+
+
+def _convert_to_dict_value(value: Any, stack: list) -> Any:
+    """Convert a single field value for dataclass_to_dict.
     
-    # If no special handling is needed, return the value as is
+    Nested dataclasses become dicts with their keys in place; they are pushed onto
+    the stack to have their values filled in.
+    """
+    if hasattr(value, '__dataclass_fields__'):
+        # Nested dataclass, converted when popped from the stack
+        nested = dict.fromkeys(_field_names(type(value)))
+        stack.append((nested, value))
+        return nested
+    if isinstance(value, (list, tuple)):
+        # Handle lists/tuples of dataclasses
+        return [_convert_to_dict_value(item, stack) if hasattr(item, '__dataclass_fields__') else item
+                for item in value]
     return value
 
 
@@ -128,21 +368,62 @@ def dataclass_to_dict(obj: Any) -> dict:
     if not hasattr(obj, '__dataclass_fields__'):
         return obj
     
-    result = {}
-    for field_name, field in obj.__dataclass_fields__.items():
-        value = getattr(obj, field_name)
-        if hasattr(value, '__dataclass_fields__'):
-            # Recursively convert nested dataclass
-            result[field_name] = dataclass_to_dict(value)
-        elif isinstance(value, (list, tuple)):
-            # Handle lists/tuples of dataclasses
-            result[field_name] = [dataclass_to_dict(item) if hasattr(item, '__dataclass_fields__') else item 
-                                for item in value]
-        else:
-            result[field_name] = value
+    # Walk nested dataclasses with an explicit stack instead of recursion. Each dict
+    # is created with all of its keys up front, so filling in values never resizes it.
+    result = dict.fromkeys(_field_names(type(obj)))
+    stack = [(result, obj)]
+    while stack:
+        target, source = stack.pop()
+        for name in _field_names(type(source)):
+            target[name] = _convert_to_dict_value(getattr(source, name), stack)
     return result
 
 
+class _FieldSpec(NamedTuple):
+    """Type metadata of a dataclass field, precomputed for dict_to_dataclass."""
+    name: str
+    field_type: Any
+    is_optional: bool
+    inner_type: Any  # T for Optional[T], otherwise the field type itself
+    is_dataclass: bool  # Whether inner_type is a dataclass
+    is_list: bool
+    list_item_type: Any
+    list_item_is_dataclass: bool
+    convert: Callable[[Any], Any]  # Converter for non-None values of field_type
+
+
+@lru_cache(maxsize=None)
+def _field_schema(cls: Type) -> Tuple[_FieldSpec, ...]:
+    """Return the field type metadata of a dataclass in field order, computed once per class."""
+    type_hints = _cached_type_hints(cls)
+    schema = []
+    for name in _field_names(cls):
+        field_type = type_hints[name]
+        origin = get_origin(field_type)
+        is_optional = False
+        inner_type = field_type
+        if origin is Union:
+            args = get_args(field_type)
+            if len(args) == 2 and type(None) in args:
+                is_optional = True
+                inner_type = args[0] if args[1] is type(None) else args[1]
+        is_list = origin is list
+        list_item_type = get_args(field_type)[0] if is_list else None
+        schema.append(_FieldSpec(
+            name=name,
+            field_type=field_type,
+            is_optional=is_optional,
+            inner_type=inner_type,
+            # Only plain and Optional dataclass fields are converted recursively
+            is_dataclass=(origin is None or is_optional) and hasattr(inner_type, '__dataclass_fields__'),
+            is_list=is_list,
+            list_item_type=list_item_type,
+            list_item_is_dataclass=hasattr(list_item_type, '__dataclass_fields__'),
+            convert=_compile_converter(field_type),
+        ))
+    return tuple(schema)
+
+
 def dict_to_dataclass(data: dict, dataclass_type: Type) -> Any:
     """Convert a dictionary to a dataclass instance with automatic type conversion.
     
@@ -160,57 +441,219 @@ def dict_to_dataclass(data: dict, dataclass_type: Type) -> Any:
         # If the target type is not a dataclass itself, return the data as is
         return data 
         
-    type_hints = get_type_hints(dataclass_type)
-    field_values = {}
-    
-    # Iterate through fields defined in the target dataclass
-    for field_name, field in dataclass_type.__dataclass_fields__.items():
-        if field_name in data:
-            value = data[field_name]
-            field_type = type_hints[field_name]
+    # Walk nested dataclasses with an explicit stack instead of recursion. Each frame
+    # is (dataclass type, data, field values so far, remaining fields, target, key);
+    # a frame is re-pushed below its children, so instances are built bottom-up and
+    # stored into target[key] once all of their fields are converted.
+    root = [None]
+    stack = [(dataclass_type, data, {}, iter(_field_schema(dataclass_type)), root, 0)]
+    while stack:
+        frame = stack.pop()
+        cls, cls_data, field_values, remaining_fields, target, key = frame
+        for spec in remaining_fields:
+            field_name = spec.name
+            if field_name not in cls_data:
+                # The dataclass __init__ will use its default/default_factory
+                continue
+            value = cls_data[field_name]
             
-            # Check if the field type is Optional[T]
-            origin = get_origin(field_type)
-            if origin is Union:
-                args = get_args(field_type)
-                if len(args) == 2 and type(None) in args:
-                    # Get the non-None type from Optional[T]
-                    actual_field_type = next(arg for arg in args if arg is not type(None))
-                    
-                    # If the actual type is a dataclass, recursively convert
-                    if value is not None and hasattr(actual_field_type, '__dataclass_fields__'):
-                        field_values[field_name] = dict_to_dataclass(value, actual_field_type)
-                    else:
-                        field_values[field_name] = convert_value_to_type(value, field_type)
-                else:
-                    # Handle other Union types
-                    field_values[field_name] = convert_value_to_type(value, field_type)
-            # Check if it's a list type that might contain dataclasses
-            elif get_origin(field_type) is list:
-                if value is not None:
-                    item_type = get_args(field_type)[0]
-                    # If the list contains dataclass instances, convert each item
-                    if hasattr(item_type, '__dataclass_fields__'):
-                        field_values[field_name] = [dict_to_dataclass(item, item_type) for item in value]
-                    else:
-                        # Otherwise, apply normal conversion
-                        field_values[field_name] = convert_value_to_type(value, field_type)
-                else:
-                    field_values[field_name] = None
-            # If the field type is a dataclass, recursively convert
-            elif hasattr(field_type, '__dataclass_fields__'):
-                if value is not None:
-                    field_values[field_name] = dict_to_dataclass(value, field_type)
-                else:
-                    field_values[field_name] = None
+            if value is None and (spec.is_dataclass or spec.is_list):
+                field_values[field_name] = None
+            elif spec.is_dataclass:
+                # Plain or Optional dataclass field: convert it before resuming this one
+                stack.append(frame)
+                stack.append((spec.inner_type, value, {}, iter(_field_schema(spec.inner_type)),
+                              field_values, field_name))
+                break
+            elif spec.is_list and spec.list_item_is_dataclass:
+                # If the list contains dataclass instances, convert each item
+                item_type = spec.list_item_type
+                items = [None] * len(value)
+                field_values[field_name] = items
+                stack.append(frame)
+                for index in reversed(range(len(items))):
+                    stack.append((item_type, value[index], {}, iter(_field_schema(item_type)),
+                                  items, index))
+                break
             else:
-                # Otherwise, convert using the basic type converter
-                field_values[field_name] = convert_value_to_type(value, field_type)
-        # If field_name is not in data, the dataclass __init__ will use its default/default_factory
-                
-    # Instantiate the dataclass with the processed values
+                # Otherwise, convert using the field's basic type converter
+                field_values[field_name] = None if value is None else spec.convert(value)
+        else:
+            # All fields converted: instantiate the dataclass with the processed values
+            target[key] = _instantiate_dataclass(cls, field_values)
+    
+    return root[0]
+
+
+def _instantiate_dataclass(dataclass_type: Type, field_values: dict) -> Any:
+    """Instantiate a dataclass from converted field values, adding context to errors."""
     try:
         return dataclass_type(**field_values)
     except TypeError as e:
         # Provide more context on TypeError during instantiation
-        raise TypeError(f"Error instantiating {dataclass_type.__name__} with fields: {field_values}. Original error: {e}") 
\ No newline at end of file
+        raise TypeError(f"Error instantiating {dataclass_type.__name__} with fields: {field_values}. Original error: {e}")
+
+
+@lru_cache(maxsize=None)
+def _fast_construct_defaults(dataclass_type: Type) -> Optional[Tuple[Tuple[Any, Any], ...]]:
+    """Return the defaults needed to construct a dataclass without calling __init__.
+    
+    Skipping __init__ is only equivalent to calling it when __init__ does nothing but
+    store the fields on the instance, which rules out __post_init__, InitVar and
+    init=False fields, frozen or slotted dataclasses and custom __init__, __new__ or
+    __setattr__ methods.
+    
+    Args:
+        dataclass_type: Target dataclass type
+        
+    Returns:
+        (default, default_factory) per field, MISSING where there is none, or
+        None if instances must be built through __init__
+    """
+    own_attrs = vars(dataclass_type)
+    dataclass_fields = fields(dataclass_type)
+    if (
+        hasattr(dataclass_type, '__post_init__')
+        or any('__slots__' in vars(base) for base in dataclass_type.__mro__)
+        or dataclass_type.__new__ is not object.__new__
+        or dataclass_type.__setattr__ is not object.__setattr__
+        # Only the __init__ that @dataclass generated for this very class is known to
+        # just store the fields, so it must not be inherited or disabled with init=False
+        or '__init__' not in own_attrs
+        or '__dataclass_params__' not in own_attrs
+        or not own_attrs['__dataclass_params__'].init
+        # @dataclass keeps an __init__ written in the class body instead of generating
+        # one, and the generated one is compiled from source text ('<string>'), so an
+        # __init__ from a source file is hand-written. Only one that was itself exec'd
+        # in the class body gets past this, and if a future Python names the generated
+        # code differently, classes just fall back to calling __init__.
+        or getattr(own_attrs['__init__'], '__code__', None) is None
+        or own_attrs['__init__'].__code__.co_filename != '<string>'
+        or len(dataclass_fields) != len(dataclass_type.__dataclass_fields__)
+        or not all(f.init for f in dataclass_fields)
+    ):
+        return None
+    return tuple((f.default, f.default_factory) for f in dataclass_fields)
+
+
+@lru_cache(maxsize=None)
+def _build_ctor(dataclass_type: Type) -> Any:
+    """Generate a specialized dict -> dataclass constructor for a dataclass type.
+    
+    The generated function behaves like dict_to_dataclass(data, dataclass_type),
+    but the per-field dispatch is resolved once, at generation time, into
+    straight-line code. It also accepts a LayeredDict as data. Nested dataclasses
+    use their own generated constructors, looked up when called so that
+    self-referencing dataclasses work.
+    
+    Where it is safe (see _fast_construct_defaults), the instance is built with
+    __new__ and its fields are stored straight into __dict__, with default factories
+    only called for missing fields. Data missing a required field falls back to
+    __init__, which raises the usual error.
+    
+    Args:
+        dataclass_type: Target dataclass type
+        
+    Returns:
+        A function taking the data dictionary and returning a dataclass instance
+    """
+    namespace = {
+        '_build_ctor': _build_ctor,
+        '_instantiate': _instantiate_dataclass,
+        '_cls': dataclass_type,
+        '_CONTAINER_TYPES': _CONTAINER_TYPES,
+        '_copy_value': _copy_value,
+    }
+    defaults = _fast_construct_defaults(dataclass_type)
+    lines = ["def _ctor(data):", "    field_values = {}"]
+    fast_lines = ["def _fast_ctor(data):"]
+    stored = []
+    for index, spec in enumerate(_field_schema(dataclass_type)):
+        name = repr(spec.name)
+        value_lines = [f"    if {name} in data:", f"        value = data[{name}]"]
+        if spec.is_dataclass:
+            namespace[f'_type_{index}'] = spec.inner_type
+            expr = f"None if value is None else _build_ctor(_type_{index})(value)"
+        elif spec.is_list and spec.list_item_is_dataclass:
+            namespace[f'_type_{index}'] = spec.list_item_type
+            expr = f"None if value is None else list(map(_build_ctor(_type_{index}), value))"
+        else:
+            namespace[f'_convert_{index}'] = spec.convert
+            # Values outside dataclasses must be plain, mutable containers,
+            # not layered views or frozen cached data
+            value_lines.append("        if type(value) in _CONTAINER_TYPES:")
+            value_lines.append("            value = _copy_value(value)")
+            expr = f"None if value is None else _convert_{index}(value)"
+        lines.extend(value_lines)
+        lines.append(f"        field_values[{name}] = {expr}")
+        
+        if defaults is not None:
+            default, default_factory = defaults[index]
+            fast_lines.extend(value_lines)
+            fast_lines.append(f"        value_{index} = {expr}")
+            fast_lines.append("    else:")
+            if default is not MISSING:
+                namespace[f'_default_{index}'] = default
+                fast_lines.append(f"        value_{index} = _default_{index}")
+            elif default_factory is not MISSING:
+                namespace[f'_factory_{index}'] = default_factory
+                fast_lines.append(f"        value_{index} = _factory_{index}()")
+            else:
+                fast_lines.append("        return _ctor(data)")
+            stored.append(f"{name}: value_{index}")
+    lines.append("    return _instantiate(_cls, field_values)")
+    if defaults is not None:
+        fast_lines.append("    instance = _cls.__new__(_cls)")
+        fast_lines.append(f"    instance.__dict__ = {{{', '.join(stored)}}}")
+        fast_lines.append("    return instance")
+        lines.extend(fast_lines)
+    
+    exec(compile("\n".join(lines), f"<layro ctor for {dataclass_type.__qualname__}>", "exec"), namespace)
+    return namespace['_ctor' if defaults is None else '_fast_ctor']
+
+
+def prepare_dataclass(dataclass_type: Type) -> None:
+    """Precompute the field schemas and constructors of a dataclass and the dataclasses it nests.
+    
+    Everything computed here is cached per class, so calling this up front only
+    moves the one-time introspection cost out of the first conversion.
+    
+    Args:
+        dataclass_type: Dataclass type to prepare
+    """
+    pending = [dataclass_type]
+    seen = set()
+    while pending:
+        cls = pending.pop()
+        if cls in seen or not hasattr(cls, '__dataclass_fields__'):
+            continue
+        seen.add(cls)
+        _build_ctor(cls)
+        for spec in _field_schema(cls):
+            if spec.is_dataclass:
+                pending.append(spec.inner_type)
+            elif spec.list_item_is_dataclass:
+                pending.append(spec.list_item_type)
+
+
+def merge_layers_to_dataclass(layers: List[dict], dataclass_type: Type) -> Any:
+    """Build a dataclass instance directly from a stack of config dicts.
+    
+    Equivalent to dict_to_dataclass(deep_merge_layers(*layers), dataclass_type),
+    but no merged dictionary is built: each field is resolved across the layers
+    while the dataclass tree is constructed. Fields missing from every layer get
+    their dataclass defaults.
+    
+    Args:
+        layers: Dictionaries ordered from lowest to highest priority
+        dataclass_type: Target dataclass type
+        
+    Returns:
+        Dataclass instance
+        
+    Raises:
+        TypeError: If conversion fails
+    """
+    if not hasattr(dataclass_type, '__dataclass_fields__'):
+        return deep_merge_layers(*layers)
+    return _build_ctor(dataclass_type)(LayeredDict(*layers))
@@ -0,0 +1,99 @@
+"""
+Read-only config data for the config manager.
+
+Parsed config files are cached and shared between callers, so the loaders keep
+them frozen: dicts become MappingProxyType and lists FrozenList. This module
+provides the conversions to and from that form.
+"""
+
+from types import MappingProxyType
+from typing import Any
+
+
+class FrozenList(tuple):
+    """Read-only stand-in for a list in frozen config data (see freeze)."""
+    __slots__ = ()
+
+
+# Container types of frozen config data
+FROZEN_TYPES = frozenset({MappingProxyType, FrozenList})
+# Container types that thaw copies into plain dicts and lists
+_THAWED_TYPES = FROZEN_TYPES | {dict, list}
+
+
+def freeze(document: Any) -> Any:
+    """Return a read-only version of a parsed document that can be shared safely.
+    
+    Dicts become MappingProxyType and lists FrozenList, recursively. Containers
+    that appear several times (YAML aliases) are frozen once and stay shared.
+    A document that contains itself cannot be frozen and is returned unchanged.
+    
+    Args:
+        document: Parsed document made of dicts, lists and scalars
+    
+    Returns:
+        The frozen document
+    """
+    frozen = {}  # id of container -> frozen version
+    in_progress = set()  # ids of the containers being frozen around the current one
+    stack = [(document, False)]
+    while stack:
+        node, children_frozen = stack.pop()
+        node_id = id(node)
+        if node_id in frozen:
+            continue
+        if children_frozen:
+            in_progress.discard(node_id)
+            if type(node) is dict:
+                frozen[node_id] = MappingProxyType({k: frozen.get(id(v), v) for k, v in node.items()})
+            else:
+                frozen[node_id] = FrozenList(frozen.get(id(v), v) for v in node)
+            continue
+        if type(node) is not dict and type(node) is not list:
+            continue
+        if node_id in in_progress:
+            return document  # Recursive document
+        in_progress.add(node_id)
+        stack.append((node, True))
+        stack.extend((v, False) for v in (node.values() if type(node) is dict else node))
+    return frozen.get(id(document), document)
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of config data, such as data frozen by freeze.
+    
+    Dicts, lists and their frozen forms are copied into new plain dicts and
+    lists; everything else is shared. Like copy.deepcopy, this keeps containers
+    that appear several times shared and handles recursive data.
+    
+    Args:
+        value: Config data, frozen or not
+    
+    Returns:
+        The mutable copy
+    """
+    if type(value) not in _THAWED_TYPES:
+        return value
+    copies = {id(value): _empty_copy(value)}
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        target = copies[id(node)]
+        is_dict = type(target) is dict
+        for k, v in (node.items() if is_dict else enumerate(node)):
+            if type(v) in _THAWED_TYPES:
+                copy = copies.get(id(v))
+                if copy is None:
+                    copy = copies[id(v)] = _empty_copy(v)
+                    stack.append(v)
+                v = copy
+            if is_dict:
+                target[k] = v
+            else:
+                target.append(v)
+    return copies[id(value)]
+
+
+def _empty_copy(container: Any) -> Any:
+    """Return an empty plain container of the kind thaw copies container into."""
+    return {} if type(container) is dict or type(container) is MappingProxyType else []
@@ -2,35 +2,464 @@
 Configuration file loaders for the config manager.
 
 This module provides functions for loading configuration from different file formats.
-Currently supports YAML, with potential for extension to JSON, TOML, etc.
+Currently supports YAML and JSON, with potential for extension to TOML, etc.
 """
 
-import yaml
+import codecs
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
 
+from .frozen import freeze, thaw
 
-def load_yaml_config(file_path: Path) -> Dict[str, Any]:
+# yaml is imported on first use to keep `import layro` cheap
+_Loader = None
+# Likewise for orjson, which is optional: False until resolved, None if not installed
+_orjson_loads = False
+
+# Futures of parsed YAML files keyed by (device, inode, modification time in ns, size),
+# least recently used first. The key comes from the stat() call that also checks the
+# file exists, so aliases of the same file share an entry at no extra syscall cost.
+# Caching futures rather than results lets concurrent loads of a file share one parse.
+# Documents are stored frozen (see frozen.freeze), so they can be shared read-only.
+_YAML_CACHE: "OrderedDict[Tuple[int, int, int, int], Future]" = OrderedDict()
+_YAML_CACHE_SIZE = 128
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _yaml_loader() -> type:
+    """Return the YAML loader class to use, resolving it on first call."""
+    global _Loader
+    if _Loader is None:
+        try:
+            # Prefer the libyaml-backed loader; it is several times faster than the pure-Python one
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+        _Loader = loader
+    return _Loader
+
+
+def load_yaml_config(file_path: Path, frozen: bool = False) -> Dict[str, Any]:
     """Load a YAML file into a dictionary.
     
+    Parsed files are cached by file identity, modification time and size, so
+    repeated loads of an unchanged file skip parsing. Files with a .json suffix
+    are parsed with a JSON parser instead, since JSON is a subset of YAML. The
+    format is chosen by the suffix alone, not by the file's contents.
+    
     Args:
         file_path: Path to the YAML file
+        frozen: Return the shared, read-only cached data (MappingProxyType and
+            tuple-based lists) instead of a private mutable copy
         
     Returns:
         Dictionary containing the YAML contents
         
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the YAML (or JSON) is invalid
+    """
+    return load_yaml_configs([file_path], frozen=frozen)[0]
+
+
+def load_yaml_header(
+    file_path: Path,
+    required_keys: Collection[str] = (),
+    max_bytes: int = 4096
+) -> Dict[str, Any]:
+    """Load the leading top-level keys of a YAML file without parsing all of it.
+    
+    Only the first max_bytes of the file are parsed, cut back to the last full
+    line. The last top-level key of a cut-off header is dropped, as its value may
+    be incomplete. If the file fits in max_bytes, or the header cannot be parsed on
+    its own or lacks any of the required keys, the whole file is loaded instead,
+    through load_yaml_config. A cut-down header is not cached, but like every
+    loaded config it is a private mutable dictionary with interned keys.
+    
+    Args:
+        file_path: Path to the YAML file
+        required_keys: Top-level keys the result must contain if the file has them
+        max_bytes: Number of bytes to read for the header
+        
+    Returns:
+        Dictionary with (at least) the leading top-level keys of the file
+        
     Raises:
         FileNotFoundError: If the file does not exist
         yaml.YAMLError: If the YAML is invalid
     """
-    if not file_path.exists():
+    import yaml
+    stamp = file_stamp(file_path)
+    if stamp is None:
         raise FileNotFoundError(f"Config file not found: {file_path}")
+    if stamp[3] <= max_bytes:
+        # The header is the whole file, which may well be cached already
+        return load_yaml_config(file_path)
     
-    with open(file_path, 'r') as f:
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read(max_bytes)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {file_path}")
+    try:
+        header = yaml.load(data[:data.rfind(b'\n') + 1], Loader=_yaml_loader())
+    except yaml.YAMLError:
+        header = None
+    if isinstance(header, dict) and header:
+        header.pop(next(reversed(header)))
+        if all(key in header for key in required_keys):
+            return _intern_keys(header)
+    return load_yaml_config(file_path)
+
+
+def load_yaml_config_fast(file_path: Path) -> Dict[str, Any]:
+    """Load a YAML file by building Python objects straight from the parser events.
+    
+    This skips the node tree that yaml.load composes before constructing objects.
+    It handles plain YAML only: documents using anchors, aliases, explicit tags or
+    merge keys are handed to load_yaml_config, which also reports parse errors.
+    Unlike load_yaml_config, results are not cached.
+    
+    Args:
+        file_path: Path to the YAML file
+        
+    Returns:
+        Dictionary containing the YAML contents
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the YAML is invalid
+    """
+    import yaml
+    try:
+        data = file_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {file_path}")
+    try:
+        document = _build_from_events(yaml.parse(data, Loader=_yaml_loader()))
+    except yaml.YAMLError:
+        document = _UNSUPPORTED
+    if document is _UNSUPPORTED:
+        return load_yaml_config(file_path)
+    return document or {}
+
+
+# Marker for documents (or mapping keys) that _build_from_events does not handle
+_UNSUPPORTED = object()
+# Resolver and constructor for plain scalars, created on first use
+_scalar_tools = None
+
+
+def _build_from_events(events: Any) -> Any:
+    """Assemble a single YAML document from parser events, or return _UNSUPPORTED."""
+    global _scalar_tools
+    import yaml
+    if _scalar_tools is None:
+        _scalar_tools = (yaml.resolver.Resolver(), yaml.constructor.SafeConstructor())
+    resolver, constructor = _scalar_tools
+    
+    document = None
+    documents = 0
+    # Values of the plain scalars seen in this document, by their text
+    plain_scalars = {}
+    # Collections being built, innermost last, as [container, key awaiting its value]
+    stack = []
+    for event in events:
+        event_type = type(event)
+        if event_type is yaml.ScalarEvent:
+            if event.anchor is not None or event.tag is not None:
+                return _UNSUPPORTED
+            if not event.implicit[0]:
+                value = event.value  # Quoted scalars are always strings
+            else:
+                # Plain scalars resolve to immutable values, so repeated ones can be shared
+                value = plain_scalars.get(event.value, _UNSUPPORTED)
+                if value is _UNSUPPORTED:
+                    tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+                    construct = constructor.yaml_constructors.get(tag)
+                    if construct is None or tag == 'tag:yaml.org,2002:merge':
+                        return _UNSUPPORTED
+                    value = construct(constructor, yaml.ScalarNode(tag, event.value))
+                    plain_scalars[event.value] = value
+        elif event_type is yaml.MappingStartEvent or event_type is yaml.SequenceStartEvent:
+            if event.anchor is not None or event.tag is not None:
+                return _UNSUPPORTED
+            stack.append([{} if event_type is yaml.MappingStartEvent else [], _UNSUPPORTED])
+            continue
+        elif event_type is yaml.MappingEndEvent or event_type is yaml.SequenceEndEvent:
+            value = stack.pop()[0]
+        elif event_type is yaml.DocumentStartEvent:
+            documents += 1
+            if documents > 1:
+                return _UNSUPPORTED
+            continue
+        elif event_type is yaml.AliasEvent:
+            return _UNSUPPORTED
+        else:
+            continue
+        
+        # Store the completed value in its parent collection
+        if not stack:
+            document = value
+            continue
+        parent = stack[-1]
+        if type(parent[0]) is list:
+            parent[0].append(value)
+        elif parent[1] is _UNSUPPORTED:
+            if isinstance(value, (dict, list)):
+                return _UNSUPPORTED  # Complex mapping keys
+            parent[1] = value
+        else:
+            parent[0][parent[1]] = value
+            parent[1] = _UNSUPPORTED
+    return document
+
+
+def file_stamp(file_path: Path) -> Optional[Tuple[int, int, int, int]]:
+    """Identify the current version of a file from its metadata.
+    
+    The stamp changes whenever the file is rewritten or replaced, so it can
+    be used to tell whether data derived from the file is still current.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Tuple of (device, inode, mtime in ns, size), or None if the file does not exist
+    """
+    try:
+        st = file_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        # A parent that is a file means the path cannot exist, as with Path.exists()
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def load_yaml_configs(
+    file_paths: List[Path],
+    optional: Collection[Path] = (),
+    frozen: bool = False
+) -> List[Dict[str, Any]]:
+    """Load several YAML files, parsing all uncached ones in a single pass.
+    
+    Files that are not in the cache yet are joined into one multi-document
+    stream and parsed with a single loader, which amortizes the loader setup.
+    If the batch cannot be split back into one document per file (for example
+    because a file has its own document markers) or fails to parse, each file
+    is parsed on its own so errors point at the offending file. Files with a
+    .json suffix are parsed as JSON whatever their contents, see load_yaml_config.
+    
+    Args:
+        file_paths: Paths to the YAML files
+        optional: Paths that may be missing; they load as empty dictionaries
+        frozen: Return the shared, read-only cached data instead of private copies
+        
+    Returns:
+        List of dictionaries with the contents of each file, in order
+        
+    Raises:
+        FileNotFoundError: If a file not listed in optional does not exist
+        yaml.YAMLError: If the YAML (or JSON) is invalid
+    """
+    futures: List[Future] = []
+    owned = []  # (future, path, raw bytes) of files this call has to parse
+    for file_path in file_paths:
+        cache_key = file_stamp(file_path)
+        if cache_key is None:
+            if file_path not in optional:
+                raise FileNotFoundError(f"Config file not found: {file_path}")
+            future = Future()
+            future.set_result({})
+            futures.append(future)
+            continue
+        
+        with _YAML_CACHE_LOCK:
+            future = _YAML_CACHE.get(cache_key)
+            if future is not None:
+                _YAML_CACHE.move_to_end(cache_key)
+            else:
+                # Claim the file: concurrent loads of it wait on this future
+                future = _YAML_CACHE[cache_key] = Future()
+                owned.append((future, file_path, cache_key))
+                while len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+                    _YAML_CACHE.popitem(last=False)
+        futures.append(future)
+    
+    if owned:
+        # Resolve every claimed future before waiting on anyone else's, so that
+        # concurrent callers can never wait on each other
+        try:
+            _parse_owned(owned)
+        finally:
+            for future, _, cache_key in owned:
+                if not future.done():
+                    _fail(future, cache_key, RuntimeError("Loading was interrupted"))
+    
+    if frozen:
+        return [future.result() for future in futures]
+    # Callers are free to mutate the results, so hand out copies of the cached data
+    return [thaw(future.result()) for future in futures]
+
+
+def _parse_owned(owned: List[Tuple[Future, Path, Tuple[int, int, int, int]]]) -> None:
+    """Parse claimed files, batching them where possible, and resolve their futures."""
+    pending = []
+    if len(owned) >= 2:
+        # Overlap the reads, which release the GIL, and parse once all are in. The
+        # executor only lives for this call, so no idle threads survive into a fork.
+        with ThreadPoolExecutor(max_workers=min(8, len(owned)), thread_name_prefix="layro-reader") as pool:
+            reads = [pool.submit(file_path.read_bytes) for _, file_path, _ in owned]
+    else:
+        reads = [None] * len(owned)
+    for (future, file_path, cache_key), read in zip(owned, reads):
+        try:
+            data = file_path.read_bytes() if read is None else read.result()
+            pending.append((future, file_path, cache_key, data))
+        except Exception as e:
+            _fail(future, cache_key, e)
+    
+    batchable = [item for item in pending if not _is_json(item[1]) and _is_batchable(item[3])]
+    documents = _parse_yaml_batch([item[3] for item in batchable]) if len(batchable) > 1 else None
+    if documents is not None:
+        for (future, *_), document in zip(batchable, documents):
+            future.set_result(freeze(_intern_keys(document or {})))
+    
+    for future, file_path, cache_key, data in pending:
+        if not future.done():
+            try:
+                parse = _parse_json if _is_json(file_path) else _parse_yaml
+                future.set_result(freeze(_intern_keys(parse(data, file_path))))
+            except Exception as e:
+                _fail(future, cache_key, e)
+
+
+def _intern_keys(document: Any) -> Any:
+    """Intern every string mapping key of a parsed document in place.
+    
+    Config files repeat the same field names everywhere, and interned keys let
+    the many dict lookups during merging and conversion compare by identity.
+    Cached documents are copied on the way out, which keeps the interned keys.
+    """
+    stack = [document]
+    seen = set()  # Anchors can share a node, or even make the document recursive
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, dict):
+            if any(type(key) is str for key in node):
+                items = [(sys.intern(key) if type(key) is str else key, value) for key, value in node.items()]
+                node.clear()
+                node.update(items)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return document
+
+
+def _fail(future: Future, cache_key: Tuple[int, int, int, int], error: Exception) -> None:
+    """Resolve a claimed future with an error and drop it, so failures are not cached."""
+    future.set_exception(error)
+    with _YAML_CACHE_LOCK:
+        if _YAML_CACHE.get(cache_key) is future:
+            del _YAML_CACHE[cache_key]
+
+
+def _parse_yaml(data: bytes, file_path: Path) -> Dict[str, Any]:
+    """Parse the contents of a single YAML file."""
+    import yaml
+    try:
+        return yaml.load(data, Loader=_yaml_loader()) or {}
+    except yaml.YAMLError as e:
+        raise yaml.YAMLError(f"Error parsing YAML file {file_path}: {e}")
+
+
+def _is_json(file_path: Path) -> bool:
+    """Check whether a config file is JSON, which is parsed without the YAML parser."""
+    return file_path.suffix.lower() == '.json'
+
+
+def _fast_json_loads() -> Optional[Callable[[bytes], Any]]:
+    """Return orjson's parsing function if orjson is installed, resolving it on first call."""
+    global _orjson_loads
+    if _orjson_loads is False:
+        try:
+            # orjson is an optional dependency, several times faster than the json module
+            from orjson import loads
+        except ImportError:
+            loads = None
+        _orjson_loads = loads
+    return _orjson_loads
+
+
+# Digit runs long enough to be an integer beyond 64 bits, which orjson turns into a float
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+def _parse_json(data: bytes, file_path: Path) -> Dict[str, Any]:
+    """Parse the contents of a single JSON file.
+    
+    orjson is used when it is installed, but files it would read differently
+    from the json module (other encodings than UTF-8, or integers too large for
+    64 bits) are left to the json module, so the result does not depend on which
+    parser is available. An empty file loads as an empty dict, like an empty
+    YAML file.
+    
+    Errors are raised as yaml.YAMLError, like those of JSON files parsed as YAML,
+    so callers handle invalid config files the same way whatever their format.
+    """
+    import json
+    import yaml
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    if not data.strip():
+        return {}
+    fast_loads = _fast_json_loads()
+    if fast_loads is not None and not _LONG_DIGITS.search(data):
         try:
-            return yaml.safe_load(f) or {}
-        except yaml.YAMLError as e:
-            raise yaml.YAMLError(f"Error parsing YAML file {file_path}: {e}")
+            return fast_loads(data) or {}
+        except ValueError:
+            pass  # The json module parses it, or reports the error
+    try:
+        return json.loads(data) or {}
+    except ValueError as e:
+        raise yaml.YAMLError(f"Error parsing JSON file {file_path}: {e}")
+
+
+def _is_batchable(data: bytes) -> bool:
+    """Check whether a file can safely be joined into a multi-document stream."""
+    # A byte order mark may select another encoding, and a missing final newline
+    # would change how a trailing block scalar is parsed
+    return data.endswith(b'\n') and not data.startswith((b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff'))
+
+
+def _parse_yaml_batch(blobs: List[bytes]) -> Optional[List[Any]]:
+    """Parse several YAML files as one multi-document stream.
+    
+    Returns:
+        One document per file, or None if the stream does not split back
+        into exactly one document per file or fails to parse
+    """
+    import yaml
+    parts = []
+    for data in blobs:
+        # Start every file with its own document marker, unless it already has one
+        if not data.lstrip().startswith(b'---'):
+            parts.append(b'---\n')
+        parts.append(data)
+    try:
+        documents = list(yaml.load_all(b''.join(parts), Loader=_yaml_loader()))
+    except yaml.YAMLError:
+        return None
+    if len(documents) != len(blobs):
+        return None
+    return documents
 
 
 def find_config_file(
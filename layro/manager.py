@@ -9,17 +9,42 @@ This module provides the main ConfigManager class that handles:
 """
 
 import sys
-import tyro
-from dataclasses import fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Type, TypeVar, get_type_hints
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 import argparse
 
-from .converters import convert_value_to_type, dataclass_to_dict, dict_to_dataclass, deep_merge
-from .loaders import load_yaml_config, find_config_file
+from .converters import dataclass_to_dict, merge_layers_to_dataclass, prepare_dataclass
+from .loaders import load_yaml_config, load_yaml_configs
 
 T = TypeVar('T')  # Represents the config dataclass type
 
+
+@lru_cache(maxsize=None)
+def _build_pre_parser(config_field: str, mode_field: Optional[str]) -> argparse.ArgumentParser:
+    """Build the argparse parser for the directive arguments (config file and mode field).
+    
+    The parser only depends on the two field names, so managers using the same
+    names share one parser.
+    """
+    pre_parser = argparse.ArgumentParser(add_help=False) # Disable help for this pre-parser
+    
+    # Add config_field argument (e.g., --config)
+    pre_parser.add_argument(f"--{config_field}", dest=config_field.replace('-', '_'), type=Path, action="append", default=None, 
+                           help=f"Path to config file(s). Can be specified multiple times for layered configuration.")
+
+    # Add mode_field argument (e.g., --model-type) if it exists
+    if mode_field:
+        mode_field_dest = mode_field.replace('-', '_')
+        mode_field_dash = mode_field.replace('_', '-')
+        pre_parser.add_argument(f"--{mode_field_dash}", dest=mode_field_dest, type=str, default=None)
+        # Ensure the original mode_field is also parsable if it's different from the dashed version
+        if mode_field != mode_field_dash:
+            pre_parser.add_argument(f"--{mode_field}", dest=mode_field_dest, type=str, default=None)
+    
+    return pre_parser
+
+
 class ConfigManager:
     """Manager for layered configuration from CLI args, config files, and defaults.
     
@@ -60,6 +85,11 @@ class ConfigManager:
         self.mode_field = mode_field
         self.config_field = config_field
         self.debug = enable_debug
+        # argparse stores dest with underscores (see _build_pre_parser)
+        self._config_field_dest = config_field.replace('-', '_')
+        self._mode_field_dest = mode_field.replace('-', '_') if mode_field else None
+        self._pre_parser = _build_pre_parser(config_field, mode_field)
+        prepare_dataclass(config_class)
         
     def _debug(self, *args, **kwargs):
         """Print debug information if debug mode is enabled."""
@@ -87,88 +117,19 @@ class ConfigManager:
         self._debug(f"Raw argv: {raw_argv}")
 
         # 1. Pre-parse directive arguments using argparse to get config_path and initial mode
-        pre_parser = argparse.ArgumentParser(add_help=False) # Disable help for this pre-parser
-        
-        # Add config_field argument (e.g., --config)
-        # argparse stores dest with underscores, so normalize self.config_field
-        config_field_dest = self.config_field.replace('-', '_')
-        pre_parser.add_argument(f"--{self.config_field}", dest=config_field_dest, type=str, action="append", default=None, 
-                               help=f"Path to config file(s). Can be specified multiple times for layered configuration.")
-
-        # Add mode_field argument (e.g., --model-type) if it exists
         cli_mode_value = None
-        if self.mode_field:
-            mode_field_dest = self.mode_field.replace('-', '_')
-            # Add both dash and underscore variants if they are different, argparse handles one as alias if dest is same
-            pre_parser.add_argument(f"--{self.mode_field.replace('_', '-')}", dest=mode_field_dest, type=str, default=None)
-            if '_' in self.mode_field and '-' in self.mode_field: # e.g. mode_field itself has a dash
-                 pass # already added
-            elif '_' in self.mode_field: # e.g. model_type -> also allow model-type if specified in mode_field with underscore
-                 pass # Covered by above if mode_field_dest matches
-            # Ensure the original self.mode_field is also parsable if it's different from the dashed version
-            if self.mode_field != self.mode_field.replace('_', '-'):
-                 pre_parser.add_argument(f"--{self.mode_field}", dest=mode_field_dest, type=str, default=None)
-
-
-        directive_ns, remaining_argv_for_tyro = pre_parser.parse_known_args(raw_argv)
+        directive_ns, remaining_argv_for_tyro = self._pre_parser.parse_known_args(raw_argv)
         
-        user_config_paths_str = getattr(directive_ns, config_field_dest, None) or []
-        user_config_paths = [Path(path) for path in user_config_paths_str] if user_config_paths_str else []
+        # Paths are kept as given; the loader's stat() is the only existence check
+        user_config_paths = getattr(directive_ns, self._config_field_dest, None) or []
         self._debug(f"Pre-parsed user_config_paths: {user_config_paths}")
 
         if self.mode_field:
-            cli_mode_value = getattr(directive_ns, self.mode_field.replace('-', '_'), None)
+            cli_mode_value = getattr(directive_ns, self._mode_field_dest, None)
         self._debug(f"Pre-parsed cli_mode_value: {cli_mode_value}")
 
-        # 2. Build the default configuration dictionary for tyro.cli()
-        #    This determines what tyro --help shows.
-        #    Order of precedence for this 'default_instance_for_tyro':
-        #    1. Dataclass Defaults
-        #    2. Default YAML
-        #    3. Mode Default YAML (selected based on overall mode)
-        #    4. User YAML (from --config)
-
-        #    a. Start with pure dataclass defaults
-        dataclass_defaults_instance = self.config_class()
-        final_default_dict_for_tyro = dataclass_to_dict(dataclass_defaults_instance)
-        self._debug(f"Tyro default base (dataclass): {final_default_dict_for_tyro}")
-
-        #    b. Merge Default YAML
-        default_yaml_content = self._load_default_yaml()
-        if default_yaml_content:
-            final_default_dict_for_tyro = deep_merge(default_yaml_content, final_default_dict_for_tyro)
-            self._debug(f"Tyro default after default.yaml: {final_default_dict_for_tyro}")
-
-        #    c. Load user_yaml_content to help determine authoritative_mode
-        user_yaml_content = self._load_user_yaml(user_config_paths) if user_config_paths else {}
-
-        #    d. Determine the authoritative_mode that governs which mode_default.yaml is loaded
-        #       Priority: Pre-parsed CLI > User YAML > Default YAML > Dataclass
-        authoritative_mode = cli_mode_value
-        if not authoritative_mode and self.mode_field:
-            if user_yaml_content and self.mode_field in user_yaml_content:
-                authoritative_mode = user_yaml_content[self.mode_field]
-            elif default_yaml_content and self.mode_field in default_yaml_content:
-                authoritative_mode = default_yaml_content[self.mode_field]
-            else: # Fallback to dataclass default for mode
-                authoritative_mode = getattr(dataclass_defaults_instance, self.mode_field, None)
-        
-        self._debug(f"Authoritative mode for selecting mode_default.yaml: {authoritative_mode}")
-
-        #    e. Merge Mode Default YAML
-        if self.mode_field and authoritative_mode:
-            mode_default_yaml_content = self._load_mode_default_yaml(authoritative_mode)
-            if mode_default_yaml_content:
-                final_default_dict_for_tyro = deep_merge(mode_default_yaml_content, final_default_dict_for_tyro)
-                self._debug(f"Tyro default after mode_default.yaml: {final_default_dict_for_tyro}")
-
-        #    f. Merge User YAML (user_yaml_content already loaded)
-        if user_yaml_content:
-            final_default_dict_for_tyro = deep_merge(user_yaml_content, final_default_dict_for_tyro)
-            self._debug(f"Tyro default after user.yaml: {final_default_dict_for_tyro}")
-        
-        # 3. Convert the final merged dictionary to a dataclass instance for tyro's default
-        default_instance_for_tyro = dict_to_dataclass(final_default_dict_for_tyro, self.config_class)
+        # 2. Build the default configuration instance for tyro.cli()
+        default_instance_for_tyro = self._build_default_instance(user_config_paths, cli_mode_value)
 
         #    Ensure the pre-parsed user_config_paths is correctly set on this instance,
         #    as it's a special field often not part of the YAMLs themselves.
@@ -177,9 +138,10 @@ class ConfigManager:
             if user_config_paths:
                 setattr(default_instance_for_tyro, self.config_field, user_config_paths[-1])
         
-        # 4. Parse remaining CLI arguments with tyro, using the merged YAMLs as default
+        # 3. Parse remaining CLI arguments with tyro, using the merged YAMLs as default
         #    tyro will override values in default_instance_for_tyro with args from remaining_argv_for_tyro.
         #    If --help is in remaining_argv_for_tyro, tyro handles it using default_instance_for_tyro.
+        import tyro  # Imported lazily: tyro is by far the heaviest import of this package
         try:
             final_config_obj = tyro.cli(
                 self.config_class,
@@ -189,7 +151,7 @@ class ConfigManager:
         except SystemExit as e:
             sys.exit(e.code) # Propagate exit for --help, etc.
             
-        # 5. Final check: Ensure the actual user_config_paths used for loading is on the final object.
+        # 4. Final check: Ensure the actual user_config_paths used for loading is on the final object.
         #    This is mostly for consistency, as tyro might have set it to None if 'config_field'
         #    wasn't in remaining_argv_for_tyro and its default was None.
         if hasattr(final_config_obj, self.config_field) and user_config_paths:
@@ -197,59 +159,116 @@ class ConfigManager:
             if user_config_paths:
                 setattr(final_config_obj, self.config_field, user_config_paths[-1])
             
-        # 6. Ensure the mode_field CLI value is applied - it's possible that tyro didn't handle it properly
+        # 5. Ensure the mode_field CLI value is applied - it's possible that tyro didn't handle it properly
         if self.mode_field and cli_mode_value:
             if hasattr(final_config_obj, self.mode_field):
                 setattr(final_config_obj, self.mode_field, cli_mode_value)
             
         return final_config_obj
     
-    def _load_default_yaml(self) -> Dict[str, Any]:
-        """Load the default YAML configuration file."""
-        if not self.default_config_dir:
-            return {}
-            
-        default_yaml_path = self.default_config_dir / "default.yaml"
-        if not default_yaml_path.exists():
-            return {}
-            
-        return load_yaml_config(default_yaml_path)
-    
-    def _load_mode_default_yaml(self, mode_value: str) -> Dict[str, Any]:
-        """Load the mode-specific default YAML configuration file."""
-        if not self.default_config_dir or not mode_value:
-            return {}
-            
-        mode_default_yaml_path = self.default_config_dir / f"default_{mode_value}.yaml"
-        if not mode_default_yaml_path.exists():
-            return {}
+    def _build_default_instance(self, user_config_paths: List[Path], cli_mode_value: Optional[str]) -> Any:
+        """Build the default instance for tyro from the dataclass defaults and all YAML layers.
+        
+        Args:
+            user_config_paths: List of paths to user config files
+            cli_mode_value: Mode given on the command line, if any
             
-        return load_yaml_config(mode_default_yaml_path)
+        Returns:
+            The default instance
+        """
+        # This determines what tyro --help shows.
+        #  Order of precedence for this 'default_instance_for_tyro':
+        #  1. Dataclass Defaults
+        #  2. Default YAML
+        #  3. Mode Default YAML (selected based on overall mode)
+        #  4. User YAML (from --config)
+
+        #  a. Start with pure dataclass defaults
+        dataclass_defaults_instance = self.config_class()
+
+        #  b. Load Default YAML, and
+        #  c. User YAMLs to help determine authoritative_mode (parsed in one batch),
+        #     kept as separate layers so they are merged in the same pass as the others
+        default_yaml_content, user_yaml_layers = self._load_default_and_user_yaml(user_config_paths)
+
+        #  d. Determine the authoritative_mode that governs which mode_default.yaml is loaded
+        #     Priority: Pre-parsed CLI > User YAML > Default YAML > Dataclass
+        authoritative_mode = cli_mode_value
+        if not authoritative_mode and self.mode_field:
+            user_layer_with_mode = next(
+                (layer for layer in reversed(user_yaml_layers) if self.mode_field in layer), None
+            )
+            if user_layer_with_mode is not None:  # The last user YAML setting it wins
+                authoritative_mode = user_layer_with_mode[self.mode_field]
+            elif default_yaml_content and self.mode_field in default_yaml_content:
+                authoritative_mode = default_yaml_content[self.mode_field]
+            else: # Fallback to dataclass default for mode
+                authoritative_mode = getattr(dataclass_defaults_instance, self.mode_field, None)
+        
+        self._debug(f"Authoritative mode for selecting mode_default.yaml: {authoritative_mode}")
+
+        #  e. Load Mode Default YAML
+        mode_default_yaml_content = {}
+        if self.mode_field and authoritative_mode:
+            mode_default_yaml_content = self._load_mode_default_yaml(authoritative_mode)
+
+        if not default_yaml_content and not any(user_yaml_layers) and not mode_default_yaml_content:
+            # No YAML overrides: the dataclass defaults are already the tyro default,
+            # so skip the dataclass -> dict -> dataclass round trip
+            default_instance_for_tyro = dataclass_defaults_instance
+            self._debug("No YAML overrides, using dataclass defaults for tyro")
+        else:
+            #    f. Layer the YAMLs over the dataclass defaults, lowest priority first.
+            #       Only fields some YAML sets need the dataclass defaults as a base layer;
+            #       the others are left out and rebuilt by the dataclass constructor.
+            yaml_layers = [default_yaml_content, mode_default_yaml_content, *user_yaml_layers]
+            dataclass_defaults_dict = dataclass_to_dict(dataclass_defaults_instance)
+            base_layer = {
+                k: v for k, v in dataclass_defaults_dict.items()
+                if any(k in layer for layer in yaml_layers)
+            }
+            self._debug(f"Tyro default base (dataclass, fields set by YAML): {base_layer}")
+
+            #    g. Resolve the layers straight into a dataclass instance for tyro's default,
+            #       without building the merged dictionary
+            default_instance_for_tyro = merge_layers_to_dataclass([base_layer, *yaml_layers], self.config_class)
+
+        return default_instance_for_tyro
     
-    def _load_user_yaml(self, user_config_paths: Optional[List[Path]]) -> Dict[str, Any]:
-        """Load the user-specified YAML configuration files.
+    def _load_default_and_user_yaml(self, user_config_paths: List[Path]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Load the default YAML and the user-specified YAML files in a single batch.
         
-        When multiple config files are provided, they are merged in order, with later files
-        taking precedence over earlier ones.
+        The mode-specific default YAML cannot join the batch, since which file it is
+        depends on the contents of these files.
         
         Args:
             user_config_paths: List of paths to user config files
             
         Returns:
-            Merged dictionary from all user config files
+            Tuple of the default YAML contents and the contents of each user YAML, in
+            command-line order (later files take precedence over earlier ones)
         """
-        if not user_config_paths:
-            return {}
+        paths = list(user_config_paths)
+        default_yaml_path = self.default_config_dir / "default.yaml" if self.default_config_dir else None
+        if default_yaml_path is not None:
+            paths.insert(0, default_yaml_path)
+        if not paths:
+            return {}, []
         
-        # Start with an empty dict
-        merged_config = {}
-        
-        # Process each config file in order, with later files overriding earlier ones
-        for config_path in user_config_paths:
-            # If the user explicitly specified a config file, it should exist and be valid
-            # load_yaml_config will raise appropriate errors if it doesn't exist or has YAML errors
-            config_data = load_yaml_config(config_path)
-            # Merge this config into the accumulated result
-            merged_config = deep_merge(config_data, merged_config)
+        # If the user explicitly specified a config file, it should exist and be valid;
+        # load_yaml_configs will raise appropriate errors if it doesn't exist or has YAML errors
+        # The layers are only read, so the cached data is used as is, without copying
+        contents = load_yaml_configs(paths, optional=[default_yaml_path] if default_yaml_path else (), frozen=True)
+        default_yaml_content = contents.pop(0) if default_yaml_path is not None else {}
+        return default_yaml_content, contents
+    
+    def _load_mode_default_yaml(self, mode_value: str) -> Dict[str, Any]:
+        """Load the mode-specific default YAML configuration file."""
+        if not self.default_config_dir or not mode_value:
+            return {}
             
-        return merged_config 
\ No newline at end of file
+        mode_default_yaml_path = self.default_config_dir / f"default_{mode_value}.yaml"
+        try:
+            return load_yaml_config(mode_default_yaml_path, frozen=True)
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
@@ -35,6 +35,42 @@ class ComplexTestConfig:
     nested: NestedConfig = field(default_factory=NestedConfig)
 
 
+# Invalid YAML: unclosed string
+INVALID_YAML = b"""\
+value: 100
+name: "unclosed string
+"""
+
+# Config files for test_multi_config_basic
+BASIC_CONFIG1_YAML = b"""\
+value: 100
+"""
+BASIC_CONFIG2_YAML = b"""\
+name: from_config2
+"""
+
+# Config files for test_multi_config_with_cli_override
+OVERRIDE_CONFIG1_YAML = b"""\
+value: 100
+name: from_config1
+"""
+OVERRIDE_CONFIG2_YAML = b"""\
+value: 200
+"""
+
+# Config files for test_nested_config_merging
+NESTED_CONFIG1_YAML = b"""\
+value: 100
+nested:
+  nested_value: 500
+"""
+NESTED_CONFIG2_YAML = b"""\
+name: from_config2
+nested:
+  nested_name: from_config2_nested
+"""
+
+
 def test_error_on_nonexistent_config_file(tmp_path):
     """Test that an error is raised when the specified config file does not exist."""
     config_manager = ConfigManager(
@@ -57,10 +93,7 @@ def test_error_on_invalid_yaml(tmp_path):
     
     # Create a file with invalid YAML
     invalid_yaml_file = tmp_path / "invalid.yaml"
-    invalid_yaml_file.write_text("""
-    value: 100
-    name: "unclosed string
-    """)
+    invalid_yaml_file.write_bytes(INVALID_YAML)
     
     # This should raise a YAMLError
     with pytest.raises(Exception) as excinfo:
@@ -76,14 +109,10 @@ def test_multi_config_basic(tmp_path):
     
     # Create two config files
     config1 = tmp_path / "config1.yaml"
-    config1.write_text("""
-    value: 100
-    """)
+    config1.write_bytes(BASIC_CONFIG1_YAML)
     
     config2 = tmp_path / "config2.yaml"
-    config2.write_text("""
-    name: from_config2
-    """)
+    config2.write_bytes(BASIC_CONFIG2_YAML)
     
     # Test with multiple config files
     config = config_manager.parse_args([
@@ -104,15 +133,10 @@ def test_multi_config_with_cli_override(tmp_path):
     
     # Create config files
     config1 = tmp_path / "config1.yaml"
-    config1.write_text("""
-    value: 100
-    name: from_config1
-    """)
+    config1.write_bytes(OVERRIDE_CONFIG1_YAML)
     
     config2 = tmp_path / "config2.yaml"
-    config2.write_text("""
-    value: 200
-    """)
+    config2.write_bytes(OVERRIDE_CONFIG2_YAML)
     
     # Test with multiple config files and CLI override
     config = config_manager.parse_args([
@@ -136,18 +160,10 @@ def test_nested_config_merging(tmp_path):
     
     # Create config files with nested structures
     config1 = tmp_path / "config1.yaml"
-    config1.write_text("""
-    value: 100
-    nested:
-      nested_value: 500
-    """)
+    config1.write_bytes(NESTED_CONFIG1_YAML)
     
     config2 = tmp_path / "config2.yaml"
-    config2.write_text("""
-    name: from_config2
-    nested:
-      nested_name: from_config2_nested
-    """)
+    config2.write_bytes(NESTED_CONFIG2_YAML)
     
     # Test with multiple config files
     config = config_manager.parse_args([
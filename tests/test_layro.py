@@ -10,21 +10,28 @@ This module provides comprehensive test cases for:
 - Integration tests for full configuration flow
 """
 
+import itertools
+import os
 import pytest
 import sys
 import tempfile
+import threading
+import yaml
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
 # Updated imports to use the layro package
 from layro.converters import (
+    LayeredDict,
     deep_merge,
+    deep_merge_layers,
     convert_value_to_type,
     dataclass_to_dict,
-    dict_to_dataclass
+    dict_to_dataclass,
+    merge_layers_to_dataclass,
 )
-from layro.loaders import load_yaml_config, find_config_file
+from layro.loaders import load_yaml_config, load_yaml_config_fast, load_yaml_configs, load_yaml_header, find_config_file
 from layro.manager import ConfigManager
 
 
@@ -158,6 +165,71 @@ def test_dict_to_dataclass():
     assert result.list_config.items[1].value == 400
 
 
+def test_merge_layers_to_dataclass():
+    """Test building a dataclass straight from config layers."""
+    layers = [
+        dataclass_to_dict(TestConfig()),
+        {"simple_value": 10, "nested": {"value": 100, "name": "default"}},
+        {"nested": {"value": 200}, "list_config": {"items": [{"value": 300, "name": "item"}]}},
+        {"simple_value": "50", "nested": {"name": "user"}},
+    ]
+    
+    result = merge_layers_to_dataclass(layers, TestConfig)
+    
+    assert result == dict_to_dataclass(deep_merge_layers(*layers), TestConfig)
+    assert result.simple_value == 50
+    assert result.nested == NestedConfig(value=200, name="user")
+    assert result.list_config.items == [NestedConfig(value=300, name="item")]
+
+
+def test_merge_layers_to_dataclass_fast_construct():
+    """Test that dataclasses built without __init__ match ones built through it."""
+    factory_calls = []
+    
+    def make_tags():
+        factory_calls.append(1)
+        return ["default"]
+    
+    @dataclass
+    class PlainConfig:
+        required: int
+        nested: NestedConfig = field(default_factory=NestedConfig)
+        tags: List[str] = field(default_factory=make_tags)
+        name: str = "plain"
+    
+    result = merge_layers_to_dataclass([{"required": "1", "tags": ["a"]}, {"nested": {"value": 7}}], PlainConfig)
+    
+    assert result == PlainConfig(required=1, nested=NestedConfig(value=7), tags=["a"])
+    assert vars(result) == vars(PlainConfig(1, NestedConfig(value=7), ["a"]))
+    assert factory_calls == []  # Default factories only run for missing fields
+    assert merge_layers_to_dataclass([{"required": 2}], PlainConfig).tags == ["default"]
+    assert len(factory_calls) == 1
+    with pytest.raises(TypeError):
+        merge_layers_to_dataclass([{"name": "no required"}], PlainConfig)
+    
+    # Hand-written and inherited __init__ methods still run
+    @dataclass
+    class CustomInitConfig:
+        value: int = 0
+        
+        def __init__(self, value: int = 0):
+            self.value = value * 2
+    
+    class SubConfig(PlainConfig):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.name = "sub"
+    
+    # An __init__ compiled from a string, like the generated ones, but not by @dataclass
+    namespace = {}
+    exec("def __init__(self, required, **kwargs):\n    self.__dict__.update(required=required, name='exec')", namespace)
+    ExecInitConfig = type("ExecInitConfig", (PlainConfig,), {"__init__": namespace["__init__"]})
+    
+    assert merge_layers_to_dataclass([{"value": 3}], CustomInitConfig).value == 6
+    assert merge_layers_to_dataclass([{"required": 1}], SubConfig).name == "sub"
+    assert merge_layers_to_dataclass([{"required": 1}], ExecInitConfig).name == "exec"
+
+
 def test_deep_merge():
     """Test deep merging of dictionaries."""
     base = {
@@ -188,6 +260,45 @@ def test_deep_merge():
     assert result["new_field"] == "override_only"  # From override
 
 
+def test_deep_merge_layers():
+    """Test that merging layers in one pass matches pairwise deep merging."""
+    dataclass_layer = {"a": 1, "nested": {"x": 1, "y": 2}, "replaced": {"k": 1}}
+    default_layer = {"nested": {"x": 10}, "replaced": 5}
+    mode_layer = {"replaced": {"k": 2}, "mode_only": True}
+    user_layer = {"a": 100, "nested": {"y": 20, "z": 30}}
+    
+    layers = [dataclass_layer, default_layer, mode_layer, user_layer]
+    expected = {}
+    for layer in layers:
+        expected = deep_merge(layer, expected)
+    
+    result = deep_merge_layers(*layers)
+    
+    assert result == expected
+    assert result["nested"] == {"x": 10, "y": 20, "z": 30}
+    assert result["replaced"] == {"k": 2}  # Lower dict hidden by the scalar in default_layer
+    assert deep_merge_layers({}, {}) == {}
+
+
+def test_layered_dict():
+    """Test that LayeredDict resolves keys like deep_merge_layers without merging up front."""
+    base = {"a": 1, "nested": {"x": 1, "y": 2}, "untouched": {"k": 1}}
+    override = {"a": 2, "nested": {"y": 20}, "new": "value"}
+    
+    layered = LayeredDict(base, {}, override)
+    
+    assert layered["a"] == 2
+    assert layered["untouched"] is base["untouched"]  # Single-layer values are shared
+    assert isinstance(layered["nested"], LayeredDict)
+    assert dict(layered["nested"]) == {"x": 1, "y": 20}
+    assert "new" in layered and "missing" not in layered
+    assert list(layered) == ["a", "nested", "untouched", "new"]
+    assert len(layered) == 4
+    assert layered.to_dict() == deep_merge_layers(base, override)
+    with pytest.raises(KeyError):
+        layered["missing"]
+
+
 # --- YAML Loading Tests ---
 def test_load_yaml_config(tmp_path):
     """Test loading configuration from YAML file."""
@@ -219,6 +330,198 @@ def test_load_yaml_config(tmp_path):
     assert result["list_config"]["items"][1]["value"] == 400
 
 
+def test_load_yaml_config_cache(tmp_path):
+    """Test that cached YAML loads are isolated and refreshed when the file changes."""
+    yaml_file = tmp_path / "cached.yaml"
+    yaml_file.write_text("nested:\n  value: 1\n")
+    
+    first = load_yaml_config(yaml_file)
+    first["nested"]["value"] = 999  # Mutating the result must not leak into the cache
+    assert load_yaml_config(yaml_file)["nested"]["value"] == 1
+    
+    # Frozen loads share the cached data read-only, and still layer like dicts
+    frozen = load_yaml_config(yaml_file, frozen=True)
+    assert frozen is load_yaml_config(yaml_file, frozen=True)
+    with pytest.raises(TypeError):
+        frozen["nested"]["value"] = 999
+    assert deep_merge_layers({"nested": {"name": "base"}}, frozen) == {"nested": {"name": "base", "value": 1}}
+    
+    yaml_file.write_text("nested:\n  value: 2\n")
+    stat = yaml_file.stat()
+    os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_yaml_config(yaml_file)["nested"]["value"] == 2
+
+
+def test_merge_frozen_config(tmp_path):
+    """Test that frozen YAML data merges like dicts and comes out as plain containers."""
+    yaml_file = tmp_path / "frozen.yaml"
+    yaml_file.write_text("nested:\n  value: 1\n  tags: [a, b]\nother:\n  key: x\n")
+    frozen = load_yaml_config(yaml_file, frozen=True)
+    override = {"nested": {"name": "b"}}
+    expected = {"nested": {"value": 1, "tags": ["a", "b"], "name": "b"}, "other": {"key": "x"}}
+    
+    results = [
+        deep_merge(override, frozen),
+        deep_merge_layers(frozen, override),
+        LayeredDict(frozen, override).to_dict(),
+    ]
+    for result in results:
+        assert result == expected
+        assert type(result["nested"]) is dict and type(result["other"]) is dict
+        assert type(result["nested"]["tags"]) is list
+        result["nested"]["tags"].append("c")  # Results are mutable without touching the cache
+    assert type(deep_merge({}, frozen)) is dict
+    assert type(deep_merge_layers(frozen)["other"]) is dict
+    assert type(deep_merge(frozen, {"nested": {}})["nested"]["tags"]) is list
+    assert load_yaml_config(yaml_file)["nested"]["tags"] == ["a", "b"]
+
+
+def test_load_yaml_configs(tmp_path):
+    """Test loading several YAML files in one batch."""
+    first = tmp_path / "first.yaml"
+    first.write_text("value: 1\n")
+    second = tmp_path / "second.yaml"
+    second.write_text("---\nnested:\n  value: 2\n")
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("# only a comment\n")
+    missing = tmp_path / "missing.yaml"
+    
+    results = load_yaml_configs([first, second, empty, missing], optional=[missing])
+    assert results == [{"value": 1}, {"nested": {"value": 2}}, {}, {}]
+    
+    with pytest.raises(FileNotFoundError):
+        load_yaml_configs([first, missing])
+    
+    # Errors still name the file that failed to parse
+    invalid = tmp_path / "invalid.yaml"
+    invalid.write_text('name: "unclosed string\n')
+    with pytest.raises(Exception) as excinfo:
+        load_yaml_configs([second, invalid])
+    assert "invalid.yaml" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("orjson_installed", [True, False])
+def test_load_json_config(tmp_path, monkeypatch, orjson_installed):
+    """Test that .json config files load like their YAML equivalent, with or without orjson."""
+    import layro.loaders
+    if not orjson_installed:
+        monkeypatch.setattr(layro.loaders, "_orjson_loads", None)
+    json_file = tmp_path / "config.json"
+    json_file.write_text('{"simple_value": 5, "nested": {"value": 7, "name": "json"}, "items": [1, null]}')
+    yaml_file = tmp_path / "config.yaml"
+    yaml_file.write_text("simple_value: 5\nnested: {value: 7, name: json}\nitems: [1, null]\n")
+    
+    assert load_yaml_configs([json_file, yaml_file]) == [load_yaml_config(yaml_file)] * 2
+    
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text('{"unclosed": ')
+    with pytest.raises(yaml.YAMLError) as excinfo:  # Same error type as invalid YAML
+        load_yaml_config(invalid)
+    assert "invalid.json" in str(excinfo.value)
+    
+    # Encodings, empty files and big integers load as the json module reads them
+    files = {
+        "empty.json": b"",
+        "blank.json": b" \n\t\n",
+        "bom.json": b'\xef\xbb\xbf{"name": "bom"}',
+        "utf16.json": '{"name": "utf16"}'.encode("utf-16"),
+        "big.json": b'{"value": 123456789012345678901234567890, "small": 12}',
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    
+    results = load_yaml_configs([tmp_path / name for name in files])
+    assert results == [
+        {},
+        {},
+        {"name": "bom"},
+        {"name": "utf16"},
+        {"value": 123456789012345678901234567890, "small": 12},
+    ]
+
+
+def test_load_yaml_header(tmp_path):
+    """Test loading only the leading keys of a large YAML file."""
+    yaml_file = tmp_path / "large.yaml"
+    yaml_file.write_text(
+        "model_type: advanced\nsimple_value: 5\nitems:\n"
+        + "".join(f"  - value: {i}\n" for i in range(1000))
+        + "trailing: last\n"
+    )
+    
+    header = load_yaml_header(yaml_file, required_keys=["model_type"], max_bytes=256)
+    assert header == {"model_type": "advanced", "simple_value": 5}  # Cut-off "items" is dropped
+    assert all(key is sys.intern(key) for key in header)  # Keys are interned like other loads
+    
+    # A required key beyond the header falls back to loading the whole file
+    full = load_yaml_header(yaml_file, required_keys=["trailing"], max_bytes=256)
+    assert full == load_yaml_config(yaml_file)
+    
+    # Small files are loaded in full
+    assert load_yaml_header(yaml_file, max_bytes=1 << 20)["trailing"] == "last"
+    
+    with pytest.raises(FileNotFoundError):
+        load_yaml_header(tmp_path / "missing.yaml")
+
+
+def test_load_yaml_config_fast(tmp_path):
+    """Test that the event-based loader matches load_yaml_config."""
+    yaml_file = tmp_path / "plain.yaml"
+    yaml_file.write_text("""
+simple_value: 10
+ratio: 1.5e3
+enabled: yes
+missing: null
+quoted: "42"
+date: 2024-01-02
+nested:
+  name: nested
+  items: [1, two, {value: 3}]
+list_of_dicts:
+  - value: 1
+  - value: 2
+""")
+    result = load_yaml_config_fast(yaml_file)
+    assert result == load_yaml_config(yaml_file)
+    assert result["quoted"] == "42" and result["enabled"] is True
+    
+    # Anchors, merge keys and explicit tags fall back to the regular loader
+    special_file = tmp_path / "special.yaml"
+    special_file.write_text("base: &base {value: 1}\nmerged:\n  <<: *base\n  name: x\ntagged: !!str 5\n")
+    assert load_yaml_config_fast(special_file) == load_yaml_config(special_file)
+    
+    empty_file = tmp_path / "empty.yaml"
+    empty_file.write_text("# nothing here\n")
+    assert load_yaml_config_fast(empty_file) == {}
+    
+    invalid_file = tmp_path / "invalid.yaml"
+    invalid_file.write_text('name: "unclosed string\n')
+    with pytest.raises(Exception) as excinfo:
+        load_yaml_config_fast(invalid_file)
+    assert "invalid.yaml" in str(excinfo.value)
+    with pytest.raises(FileNotFoundError):
+        load_yaml_config_fast(tmp_path / "missing.yaml")
+
+
+def test_load_yaml_config_concurrent(tmp_path, monkeypatch):
+    """Test that concurrent loads of the same file share a single parse."""
+    from concurrent.futures import ThreadPoolExecutor
+    import layro.loaders as loaders
+    
+    yaml_file = tmp_path / "shared.yaml"
+    yaml_file.write_text("value: 1\n")
+    
+    parsed = []
+    original_parse = loaders._parse_yaml
+    monkeypatch.setattr(loaders, "_parse_yaml", lambda data, path: parsed.append(path) or original_parse(data, path))
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: load_yaml_config(yaml_file), range(16)))
+    
+    assert all(result == {"value": 1} for result in results)
+    assert len(parsed) == 1
+
+
 def test_find_config_file(tmp_path):
     """Test finding configuration files in different locations."""
     # Test with existing file
@@ -245,9 +548,10 @@ def test_find_config_file(tmp_path):
 
 
 # --- ConfigManager Tests ---
-@pytest.fixture
-def config_setup(tmp_path):
-    """Set up a test configuration environment with config files."""
+@pytest.fixture(scope="session")
+def config_setup(tmp_path_factory):
+    """Set up a test configuration environment with config files (shared, read-only)."""
+    tmp_path = tmp_path_factory.mktemp("config_setup")
     # Create configs directory
     config_dir = tmp_path / "configs"
     config_dir.mkdir(exist_ok=True)
@@ -309,6 +613,22 @@ def test_config_manager_defaults(config_setup):
     assert config.nested.name == "default"  # From default.yaml
 
 
+def test_config_manager_default_config_dir_is_file(tmp_path):
+    """Test that a default_config_dir that is not a directory means no default YAMLs."""
+    not_a_dir = tmp_path / "not_a_dir"
+    not_a_dir.write_text("")
+    config_manager = ConfigManager(
+        config_class=TestConfig,
+        default_config_dir=not_a_dir,
+        mode_field="model_type"
+    )
+    
+    config = config_manager.parse_args(["--model-type", "advanced"])
+    
+    assert config.simple_value == 1  # Dataclass default
+    assert config.model_type == "advanced"  # From CLI arg
+
+
 def test_config_manager_with_mode(config_setup):
     """Test ConfigManager with mode-specific configuration."""
     config_manager = ConfigManager(
@@ -346,6 +666,75 @@ def test_config_manager_with_user_config(config_setup):
     assert config.nested.name == "user"  # From user_config.yaml
 
 
+def test_config_manager_yaml_anchors(tmp_path):
+    """Test that YAML anchors and merge keys are resolved by the parser."""
+    config_dir = tmp_path / "configs"
+    config_dir.mkdir()
+    (config_dir / "default.yaml").write_text("""
+nested: &shared_nested
+  value: 7
+  name: shared
+list_config:
+  items:
+    - *shared_nested
+    - <<: *shared_nested
+      name: second
+""")
+    config_manager = ConfigManager(config_class=TestConfig, default_config_dir=config_dir)
+    
+    config = config_manager.parse_args(["--nested.value", "8"])
+    
+    assert config.nested.value == 8  # From CLI arg
+    assert config.nested.name == "shared"  # From the anchored mapping
+    assert [(item.value, item.name) for item in config.list_config.items] == [
+        (7, "shared"),  # Alias of the anchored mapping
+        (7, "second"),  # Merge key with a local override
+    ]
+
+
+def test_config_manager_default_cache(config_setup, tmp_path):
+    """Test that repeated parses reuse the defaults until a source YAML changes."""
+    config_manager = ConfigManager(
+        config_class=TestConfig,
+        default_config_dir=config_setup["config_dir"],
+        mode_field="model_type"
+    )
+    user_yaml_file = tmp_path / "cached_user.yaml"
+    user_yaml_file.write_text("nested:\n  name: first\n")
+
+    first = config_manager.parse_args(["--config", str(user_yaml_file)])
+    first.nested.name = "mutated"  # Mutating a result must not leak into the next parse
+    assert config_manager.parse_args(["--config", str(user_yaml_file)]).nested.name == "first"
+
+    user_yaml_file.write_text("nested:\n  name: second\n")
+    stat = user_yaml_file.stat()
+    os.utime(user_yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    config = config_manager.parse_args(["--config", str(user_yaml_file)])
+    assert config.nested.name == "second"  # From the rewritten user YAML
+    assert config.nested.value == 100  # From default.yaml
+
+
+def test_config_manager_fresh_default_factories(config_setup):
+    """Test that default factories run on every parse, even with cached YAML layers."""
+    @dataclass
+    class FactoryConfig:
+        simple_value: int = 1
+        run_id: int = field(default_factory=itertools.count().__next__)
+        lock: Any = field(default_factory=threading.Lock)  # Cannot be deep-copied
+    
+    config_manager = ConfigManager(
+        config_class=FactoryConfig,
+        default_config_dir=config_setup["config_dir"]
+    )
+    
+    first = config_manager.parse_args([])
+    second = config_manager.parse_args([])
+    
+    assert second.simple_value == 10  # From default.yaml
+    assert first.run_id != second.run_id
+    assert first.lock is not second.lock
+
+
 def test_config_manager_priority_order(config_setup):
     """Test that ConfigManager correctly applies priority order for configuration values."""
     config_manager = ConfigManager(
@@ -449,9 +838,10 @@ def test_config_manager_help_text_with_defaults(config_setup, monkeypatch):
 
 
 # --- Integration Tests ---
-@pytest.fixture
-def full_config_setup(tmp_path):
-    """Create a complete configuration setup for integration testing."""
+@pytest.fixture(scope="session")
+def full_config_setup(tmp_path_factory):
+    """Create a complete configuration setup for integration testing (shared, read-only)."""
+    tmp_path = tmp_path_factory.mktemp("full_config_setup")
     # Create config files structure
     config_dir = tmp_path / "configs"
     config_dir.mkdir(exist_ok=True)
@@ -21,39 +21,59 @@ class MultiConfigTest:
     list_values: List[str] = field(default_factory=list)
 
 
-def test_multi_config_layering(tmp_path):
+# Config 1: Sets base values
+CONFIG1_YAML = b"""\
+value: 10
+name: config1
+list_values:
+  - item1
+  - item2
+"""
+
+# Config 2: Overrides some values, adds nested_value
+CONFIG2_YAML = b"""\
+value: 20
+nested_value: 100
+list_values:
+  - item3
+  - item4
+"""
+
+# Config 3: Final overrides
+CONFIG3_YAML = b"""\
+name: config3
+"""
+
+# Configs overridden from the CLI: both set every field the CLI overrides
+OVERRIDDEN_CONFIG1_YAML = b"""\
+value: 10
+name: config1
+"""
+OVERRIDDEN_CONFIG2_YAML = b"""\
+value: 20
+name: config2
+"""
+
+
+@pytest.fixture(scope="module")
+def multi_configs(tmp_path_factory):
+    """Write the layered config files once for the tests in this module that share them."""
+    config_dir = tmp_path_factory.mktemp("multi_config")
+    paths = []
+    for index, content in enumerate((CONFIG1_YAML, CONFIG2_YAML, CONFIG3_YAML), start=1):
+        path = config_dir / f"config{index}.yaml"
+        path.write_bytes(content)
+        paths.append(path)
+    return tuple(paths)
+
+
+def test_multi_config_layering(multi_configs):
     """Test that multiple configuration files are layered correctly."""
     # Create config manager
     config_manager = ConfigManager(
         config_class=MultiConfigTest,
     )
-    
-    # Create config files
-    # Config 1: Sets base values
-    config1 = tmp_path / "config1.yaml"
-    config1.write_text("""
-    value: 10
-    name: config1
-    list_values:
-      - item1
-      - item2
-    """)
-    
-    # Config 2: Overrides some values, adds nested_value
-    config2 = tmp_path / "config2.yaml"
-    config2.write_text("""
-    value: 20
-    nested_value: 100
-    list_values:
-      - item3
-      - item4
-    """)
-    
-    # Config 3: Final overrides
-    config3 = tmp_path / "config3.yaml"
-    config3.write_text("""
-    name: config3
-    """)
+    config1, config2, config3 = multi_configs
     
     # Test with a single config file
     config_single = config_manager.parse_args(["--config", str(config1)])
@@ -90,16 +110,9 @@ def test_multi_config_with_cli_overrides(tmp_path):
     
     # Create config files
     config1 = tmp_path / "config1.yaml"
-    config1.write_text("""
-    value: 10
-    name: config1
-    """)
-    
+    config1.write_bytes(OVERRIDDEN_CONFIG1_YAML)
     config2 = tmp_path / "config2.yaml"
-    config2.write_text("""
-    value: 20
-    name: config2
-    """)
+    config2.write_bytes(OVERRIDDEN_CONFIG2_YAML)
     
     # Test that CLI args override config files
     config = config_manager.parse_args([